@@ -7,7 +7,7 @@ from slack_sdk.web import SlackResponse
 import slack_utils as su
 import os
 import boto3
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from datetime import date
 from datetime import datetime as dt
 from os import path
@@ -19,6 +19,15 @@ DAYS_BETWEEN_RUNS = int(os.environ.get("DAYS_BETWEEN_RUNS", "14"))
 PROMPT_DAYS = DAYS_BETWEEN_RUNS / 2
 USER_LIMIT = int(os.environ.get("USER_LIMIT", "500"))
 CSV_FIELD_NAMES = ['name1', 'name2', 'conversation_id', 'match_date', 'prompted']
+SCHEDULE_ROUNDS = int(os.environ.get("SCHEDULE_ROUNDS", "0"))
+SCHEDULE_FIELD_NAMES = ['round', 'name1', 'name2', 'match_strength']
+# Scheduled pairings are counted as previous matches, but haven't happened yet so have no real date
+SCHEDULED_MATCH_DATE = "scheduled"
+SEATING_ATTEMPTS = 20
+SEATING_SWAPS = 200
+REPAIR_ATTEMPTS = 20
+# Leftover groups up to this size are matched exhaustively when repairing the schedule
+EXACT_MATCH_LIMIT = 10
 
 CHANNELS = os.environ.get("SLACK_CHANNELS", "CHANNEL_1:CHANNEL_1_ID")
 POST_MATCHES = os.environ.get("POST_MATCHES", False)
@@ -74,7 +83,20 @@ def main():
 
         # if it's been more than enough days, run more matches.
         if days_since_last_run >= DAYS_BETWEEN_RUNS:
-            matches: List[Dict[str, str]] = execute_channel_matches(channel_id, channel_users, channel_history, POST_MATCHES, SESSION)
+            # When scheduling is enabled, matches are read from the precomputed schedule instead of solved now.
+            channel_schedule: Optional[List[Dict[str, str]]] = None
+            if SCHEDULE_ROUNDS > 0:
+                channel_schedule_file: str = get_schedule_file_path(channel_id, channel_name, HISTORY_DIR)
+                channel_schedule = parse_history_file(channel_schedule_file)
+
+            matches: List[Dict[str, str]] = execute_channel_matches(
+                channel_id,
+                channel_users,
+                channel_history,
+                POST_MATCHES,
+                SESSION,
+                channel_schedule
+            )
             if len(matches) == 0:
                 print(f"No matches found for users in the {channel_name} channel, skipping")
                 continue
@@ -82,6 +104,12 @@ def main():
             channel_history += matches
             write_history(channel_history, channel_history_file)
 
+            if channel_schedule is not None:
+                print("Updating schedule with remaining rounds.")
+                write_history(channel_schedule, channel_schedule_file, SCHEDULE_FIELD_NAMES)
+                if S3_BUCKET_NAME is not None and POST_MATCHES:
+                    push_file_to_s3(S3_BUCKET_NAME, channel_schedule_file, f"schedule for channel: {channel}")
+
         # if it's been more than match days/2, prompt people to check if they've made a time.
         else:
             # If we don't have conversation ids saved, fetch them all.
@@ -101,7 +129,7 @@ def main():
 
         # push updated history to s3 if backed by s3
         if S3_BUCKET_NAME is not None and POST_MATCHES:
-            push_history_to_s3(S3_BUCKET_NAME, channel, HISTORY_DIR)
+            push_file_to_s3(S3_BUCKET_NAME, channel_history_file, f"history for channel: {channel}")
 
     print("Done!")
     print("Thanks for using doughnut! Goodbye!")
@@ -204,7 +232,8 @@ def execute_channel_matches(
         channel_users: List[Dict[str, str]],
         history: List[Dict],
         post_to_slack: bool,
-        session: WebClient
+        session: WebClient,
+        schedule: Optional[List[Dict[str, str]]] = None
 ) -> List[Dict[str, str]]:
     """
     Gather user information, calculate best matches, and post those matches to Slack.
@@ -213,10 +242,16 @@ def execute_channel_matches(
     :param history: History of previous matches for this channel
     :param post_to_slack: yes/no send messages in Slack channel/DMs
     :param session: Slack API session
+    :param schedule: Precomputed upcoming rounds for this channel, the next round is taken from it if provided
     :return: a list of matches made this time
     """
-    print("Generating optimal matches, this could take some time...")
-    matches: List[Dict] = create_matches(channel_users, history)
+    matches: List[Dict]
+    if schedule is not None:
+        print("Reading next round of matches from the schedule...")
+        matches = next_scheduled_round(channel_users, history, schedule)
+    else:
+        print("Generating optimal matches, this could take some time...")
+        matches = create_matches(channel_users, history)
 
     print(f"The following matches have been found: {matches}")
     if post_to_slack:
@@ -250,13 +285,7 @@ def create_matches(channel_users: List[Dict], history: List[Dict[str, str]]) ->
         'Bob': ['2021-01-01', '2021-03-07'],
         'Charlie': ['2020-12-25']
     """
-    match_counts: Dict[str, Dict[str, List[str]]] = dict()
-    for match in history:
-        person_a: str = match['name1']
-        person_b: str = match['name2']
-
-        record_match(person_a, person_b, match['match_date'], match_counts)
-        record_match(person_b, person_a, match['match_date'], match_counts)
+    match_counts: Dict[str, Dict[str, List[str]]] = build_match_counts(history)
 
     """
     Build a list of all potential pairings with a score for each:
@@ -290,15 +319,7 @@ def create_matches(channel_users: List[Dict], history: List[Dict[str, str]]) ->
     # This should only happen if we have an odd number of users
     for user in channel_users:
         if not user['matched']:
-            max_match: int
-            max_match_partner: Dict
-            for partner in channel_users:
-                if partner['name'] != user['name']:
-                    this_match_strength = calculate_match_strength(user, partner, match_counts)
-                    if max_match is None or this_match_strength > max_match:
-                        max_match = this_match_strength
-                        max_match_partner = partner
-
+            max_match_partner, max_match = find_best_partner(user, channel_users, match_counts)
             user['matched'] = True
             chosen_matches.append({
                 'user1': user,
@@ -309,6 +330,420 @@ def create_matches(channel_users: List[Dict], history: List[Dict[str, str]]) ->
     return chosen_matches
 
 
+def build_match_counts(history: List[Dict[str, str]]) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Build a record of previous pairings for each user from a list of matches
+    :param history: A list of previously matched pairs (names and dates)
+    :return: A lookup of user -> partner -> list of match dates
+    """
+    match_counts: Dict[str, Dict[str, List[str]]] = dict()
+    for match in history:
+        person_a: str = match['name1']
+        person_b: str = match['name2']
+
+        record_match(person_a, person_b, match['match_date'], match_counts)
+        record_match(person_b, person_a, match['match_date'], match_counts)
+
+    return match_counts
+
+
+def find_best_partner(
+        user: Dict,
+        candidates: List[Dict],
+        match_counts: Dict[str, Dict[str, List[str]]]
+) -> Tuple[Dict, int]:
+    """
+    Find the strongest partner for a user out of the candidates, used to double up a leftover user
+    :return: the best partner and the strength of that match
+    """
+    max_match: Optional[int] = None
+    max_match_partner: Optional[Dict] = None
+    for partner in candidates:
+        if partner['name'] != user['name']:
+            this_match_strength = calculate_match_strength(user, partner, match_counts)
+            if max_match is None or this_match_strength > max_match:
+                max_match = this_match_strength
+                max_match_partner = partner
+
+    return max_match_partner, max_match
+
+
+def plan_schedule(
+        channel_users: List[Dict],
+        history: List[Dict[str, str]],
+        rounds: int
+) -> List[Dict[str, str]]:
+    """
+    Precompute the next few rounds of matches in one go. Both a round-robin schedule and a schedule matched
+    one round at a time are planned, and the one repeating the fewest pairings (counting the history and
+    earlier planned rounds) is kept, preferring the one mixing more timezones when they are level.
+    :param channel_users: A list of active users in this channel
+    :param history: A list of previously matched pairs (names and dates)
+    :param rounds: The number of rounds to plan
+    :return: A list of scheduled pairings {round, name1, name2, match_strength}
+    """
+    candidates: List[List[Dict[str, str]]] = [
+        plan_round_robin_schedule(channel_users, history, rounds),
+        plan_greedy_schedule(channel_users, history, [], 1, rounds)
+    ]
+    return min(candidates, key=lambda schedule: (
+        count_schedule_repeats(schedule, history),
+        -count_cross_timezone(schedule, channel_users)
+    ))
+
+
+def plan_round_robin_schedule(
+        channel_users: List[Dict],
+        history: List[Dict[str, str]],
+        rounds: int
+) -> List[Dict[str, str]]:
+    """
+    Plan rounds using a round-robin, so nobody meets the same person twice within the schedule
+    until they have met everyone else in the channel.
+    With an odd number of users the user sitting out each round is doubled up with their best partner.
+    Any rounds beyond a full round-robin fall back to matching one round at a time.
+    """
+    match_counts: Dict[str, Dict[str, List[str]]] = build_match_counts(history)
+    round_robin: List[List[Dict]] = choose_round_robin(channel_users, rounds, match_counts)
+
+    schedule: List[Dict[str, str]] = []
+    for round_number, matches in enumerate(round_robin, start=1):
+        schedule += [schedule_row(str(round_number), match) for match in matches if match['user2'] is not None]
+
+    # Double up the user with the bye once the whole round-robin is known, avoiding partners they meet later on
+    for round_number, matches in enumerate(round_robin, start=1):
+        for match in matches:
+            if match['user2'] is None:
+                counts: Dict[str, Dict[str, List[str]]] = build_match_counts(history + schedule_to_history(schedule))
+                partner, match_strength = find_best_partner(match['user1'], channel_users, counts)
+                schedule.append(schedule_row(str(round_number), {
+                    'user1': match['user1'],
+                    'user2': partner,
+                    'match_strength': match_strength
+                }))
+
+    schedule = sorted(schedule, key=lambda row: int(row['round']))
+    return plan_greedy_schedule(channel_users, history, schedule, len(round_robin) + 1, rounds)
+
+
+def plan_greedy_schedule(
+        channel_users: List[Dict],
+        history: List[Dict[str, str]],
+        schedule: List[Dict[str, str]],
+        first_round: int,
+        last_round: int
+) -> List[Dict[str, str]]:
+    """
+    Add rounds to a schedule one at a time, each matched with the history and the rounds planned before it
+    counted as previous matches, then with any repeat pairings reduced.
+    """
+    schedule = list(schedule)
+    for round_number in range(first_round, last_round + 1):
+        context: List[Dict[str, str]] = history + schedule_to_history(schedule)
+        matches: List[Dict] = create_matches(channel_users, context)
+        rows: List[Dict[str, str]] = [schedule_row(str(round_number), match) for match in matches]
+        schedule += reduce_round_repeats(
+            str(round_number), rows, channel_users, context, build_match_counts(context)
+        )
+
+    return schedule
+
+
+def choose_round_robin(
+        channel_users: List[Dict],
+        rounds: int,
+        match_counts: Dict[str, Dict[str, List[str]]]
+) -> List[List[Dict]]:
+    """
+    Pick a seating order for the round-robin with the strongest matches. The best of a few random
+    seatings is improved by swapping pairs of users while that makes the matches stronger.
+    """
+    best_seating: List[Dict] = list(channel_users)
+    best_rounds: List[List[Dict]] = []
+    best_strength: Optional[int] = None
+    for _ in range(SEATING_ATTEMPTS):
+        seating: List[Dict] = random.sample(channel_users, len(channel_users))
+        candidate: List[List[Dict]] = round_robin_rounds(seating, rounds, match_counts)
+        strength: int = sum(match['match_strength'] for matches in candidate for match in matches)
+        if best_strength is None or strength > best_strength:
+            best_seating, best_rounds, best_strength = seating, candidate, strength
+
+    for _ in range(SEATING_SWAPS if len(best_seating) > 1 else 0):
+        i, j = random.sample(range(len(best_seating)), 2)
+        seating: List[Dict] = list(best_seating)
+        seating[i], seating[j] = seating[j], seating[i]
+        candidate: List[List[Dict]] = round_robin_rounds(seating, rounds, match_counts)
+        strength: int = sum(match['match_strength'] for matches in candidate for match in matches)
+        if strength > best_strength:
+            best_seating, best_rounds, best_strength = seating, candidate, strength
+
+    return best_rounds
+
+
+def round_robin_rounds(
+        seating: List[Dict],
+        rounds: int,
+        match_counts: Dict[str, Dict[str, List[str]]]
+) -> List[List[Dict]]:
+    """
+    Pair users using the circle method: the first seat stays put and everyone else rotates one seat
+    each round, giving every user a different partner each round.
+    With an odd number of users one user each round is left with no partner (user2 is None).
+    :param seating: The users in seating order
+    :param rounds: The number of rounds wanted, at most one full round-robin is returned
+    :param match_counts: previous pairings used to score each match
+    :return: A list of rounds, each a list of pairings (same format as create_matches)
+    """
+    seats: List[Optional[Dict]] = list(seating)
+    if len(seats) % 2 == 1:
+        seats.append(None)
+
+    round_robin: List[List[Dict]] = []
+    for _ in range(min(rounds, len(seats) - 1)):
+        matches: List[Dict] = []
+        for i in range(len(seats) // 2):
+            user1: Optional[Dict] = seats[i]
+            user2: Optional[Dict] = seats[-1 - i]
+            if user1 is None:
+                user1, user2 = user2, user1
+            matches.append({
+                'user1': user1,
+                'user2': user2,
+                'match_strength': 0 if user2 is None else calculate_match_strength(user1, user2, match_counts)
+            })
+        round_robin.append(matches)
+        seats = [seats[0], seats[-1]] + seats[1:-1]
+
+    return round_robin
+
+
+def next_scheduled_round(
+        channel_users: List[Dict],
+        history: List[Dict[str, str]],
+        schedule: List[Dict[str, str]]
+) -> List[Dict]:
+    """
+    Take the next round of matches off the schedule, the schedule is updated in place.
+    An empty schedule, or one longer than SCHEDULE_ROUNDS, is planned from scratch. Otherwise the
+    remaining schedule is only repaired if channel membership has changed since it was planned.
+    :param channel_users: A list of active users in this channel
+    :param history: A list of previously matched pairs (names and dates)
+    :param schedule: The precomputed schedule for this channel
+    :return: A list of pairings for this round (same format as create_matches)
+    """
+    channel_members: set = {user['name'] for user in channel_users}
+    round_count: int = len({row['round'] for row in schedule})
+    if round_count == 0 or round_count > SCHEDULE_ROUNDS:
+        print(f"No schedule of at most {SCHEDULE_ROUNDS} rounds found, planning the next {SCHEDULE_ROUNDS} rounds...")
+        schedule[:] = plan_schedule(channel_users, history, SCHEDULE_ROUNDS)
+    elif get_schedule_members(schedule) != channel_members:
+        print("Channel membership has changed, repairing the remaining schedule...")
+        repair_schedule(channel_users, history, schedule)
+
+    next_round: str = schedule[0]['round']
+    round_rows: List[Dict[str, str]] = [row for row in schedule if row['round'] == next_round]
+    schedule[:] = [row for row in schedule if row['round'] != next_round]
+
+    user_lookup: Dict[str, Dict] = {user['name']: user for user in channel_users}
+    return [{
+        'user1': user_lookup[row['name1']],
+        'user2': user_lookup[row['name2']],
+        'match_strength': int(row['match_strength'])
+    } for row in round_rows]
+
+
+def repair_schedule(
+        channel_users: List[Dict],
+        history: List[Dict[str, str]],
+        schedule: List[Dict[str, str]]
+):
+    """
+    Update the remaining schedule in place for the current channel members.
+    Pairings between users still in the channel are kept where possible, and users who have lost
+    their partner or have newly joined are matched within each round. If that would repeat a pairing
+    from elsewhere in the schedule, the round is re-solved against the full membership instead.
+    """
+    user_lookup: Dict[str, Dict] = {user['name']: user for user in channel_users}
+    round_ids: List[str] = list(dict.fromkeys(row['round'] for row in schedule))
+
+    # Keep every pairing where both users are still here, dropping any doubled up users to be re-matched
+    kept: Dict[str, List[Dict[str, str]]] = {}
+    for round_id in round_ids:
+        seen: set = set()
+        kept[round_id] = []
+        for row in schedule:
+            if row['round'] != round_id:
+                continue
+            names: set = {row['name1'], row['name2']}
+            if names.issubset(user_lookup) and names.isdisjoint(seen):
+                kept[round_id].append(row)
+                seen |= names
+
+    for round_id in round_ids:
+        paired: set = {name for row in kept[round_id] for name in (row['name1'], row['name2'])}
+        unpaired: List[Dict] = [user for user in channel_users if user['name'] not in paired]
+        if len(unpaired) == 0:
+            continue
+
+        other_rounds: List[Dict[str, str]] = [row for other in round_ids if other != round_id for row in kept[other]]
+        context: List[Dict[str, str]] = history + schedule_to_history(other_rounds)
+        match_counts: Dict[str, Dict[str, List[str]]] = build_match_counts(context)
+
+        repaired: List[Dict[str, str]] = kept[round_id] + match_leftover_users(
+            round_id, unpaired, channel_users, context, match_counts
+        )
+
+        # The leftover users may only have repeat partners between them, so break up some of the kept pairs
+        kept[round_id] = reduce_round_repeats(round_id, repaired, channel_users, context, match_counts)
+
+    schedule[:] = [row for round_id in round_ids for row in kept[round_id]]
+
+
+def reduce_round_repeats(
+        round_id: str,
+        rows: List[Dict[str, str]],
+        channel_users: List[Dict],
+        context: List[Dict[str, str]],
+        match_counts: Dict[str, Dict[str, List[str]]]
+) -> List[Dict[str, str]]:
+    """
+    Reduce the repeat pairings in a scheduled round by breaking up a repeated pair, along with a growing
+    number of other pairs, and matching those users again. Changes are only kept if they repeat less.
+    :param round_id: the scheduled round being improved
+    :param rows: the pairings in this round
+    :param channel_users: A list of active users in this channel
+    :param context: the history and other scheduled rounds, used when matching
+    :param match_counts: previous pairings built from the context
+    :return: the improved pairings for this round
+    """
+    repeats: int = count_repeats(rows, match_counts)
+    for attempt in range(REPAIR_ATTEMPTS):
+        if repeats == 0:
+            break
+        repeated: List[Dict[str, str]] = [
+            row for row in rows if get_times_paired(row['name1'], row['name2'], match_counts) > 0
+        ]
+        others: List[Dict[str, str]] = [row for row in rows if row not in repeated]
+        broken: List[Dict[str, str]] = [random.choice(repeated)] + random.sample(
+            others, min(attempt // 2, len(others))
+        )
+        remaining: List[Dict[str, str]] = [row for row in rows if row not in broken]
+        remaining_names: set = {name for row in remaining for name in (row['name1'], row['name2'])}
+        leftovers: List[Dict] = [user for user in channel_users if user['name'] not in remaining_names]
+        resolved: List[Dict[str, str]] = remaining + match_leftover_users(
+            round_id, leftovers, channel_users, context, match_counts
+        )
+        resolved_repeats: int = count_repeats(resolved, match_counts)
+        if resolved_repeats < repeats:
+            rows, repeats = resolved, resolved_repeats
+
+    return rows
+
+
+def match_leftover_users(
+        round_id: str,
+        leftovers: List[Dict],
+        channel_users: List[Dict],
+        context: List[Dict[str, str]],
+        match_counts: Dict[str, Dict[str, List[str]]]
+) -> List[Dict[str, str]]:
+    """
+    Match users left without a partner in a scheduled round, a single leftover user is doubled up
+    with their best partner from the whole channel.
+    """
+    matches: List[Dict]
+    if len(leftovers) == 1:
+        partner, match_strength = find_best_partner(leftovers[0], channel_users, match_counts)
+        matches = [{'user1': leftovers[0], 'user2': partner, 'match_strength': match_strength}]
+    elif len(leftovers) % 2 == 0 and len(leftovers) <= EXACT_MATCH_LIMIT:
+        matches = exact_matches(leftovers, match_counts)
+    else:
+        matches = create_matches(leftovers, context)
+    return [schedule_row(round_id, match) for match in matches]
+
+
+def exact_matches(users: List[Dict], match_counts: Dict[str, Dict[str, List[str]]]) -> List[Dict]:
+    """
+    Try every way of pairing up a small, even group of users and return the pairing with the fewest
+    repeats, then the strongest matches.
+    """
+    def search(remaining: List[Dict]) -> Tuple[int, int, List[Dict]]:
+        if len(remaining) == 0:
+            return 0, 0, []
+        best: Optional[Tuple[int, int, List[Dict]]] = None
+        user1: Dict = remaining[0]
+        for user2 in remaining[1:]:
+            repeats, strength, matches = search([user for user in remaining[1:] if user is not user2])
+            match: Dict = {
+                'user1': user1,
+                'user2': user2,
+                'match_strength': calculate_match_strength(user1, user2, match_counts)
+            }
+            repeats += get_times_paired(user1['name'], user2['name'], match_counts)
+            strength += match['match_strength']
+            if best is None or (repeats, -strength) < (best[0], -best[1]):
+                best = (repeats, strength, [match] + matches)
+        return best
+
+    return search(users)[2]
+
+
+def count_repeats(rows: List[Dict[str, str]], match_counts: Dict[str, Dict[str, List[str]]]) -> int:
+    """
+    Count how many times the pairings in these rows have already been matched
+    """
+    return sum(get_times_paired(row['name1'], row['name2'], match_counts) for row in rows)
+
+
+def count_schedule_repeats(schedule: List[Dict[str, str]], history: List[Dict[str, str]]) -> int:
+    """
+    Count how many scheduled pairings repeat a pairing from the history or an earlier scheduled round
+    """
+    match_counts: Dict[str, Dict[str, List[str]]] = build_match_counts(history)
+    repeats: int = 0
+    for row in sorted(schedule, key=lambda scheduled: int(scheduled['round'])):
+        repeats += get_times_paired(row['name1'], row['name2'], match_counts)
+        record_match(row['name1'], row['name2'], SCHEDULED_MATCH_DATE, match_counts)
+        record_match(row['name2'], row['name1'], SCHEDULED_MATCH_DATE, match_counts)
+    return repeats
+
+
+def count_cross_timezone(schedule: List[Dict[str, str]], channel_users: List[Dict]) -> int:
+    """
+    Count how many scheduled pairings are between users in different timezones
+    """
+    timezones: Dict[str, str] = {user['name']: user['tz'] for user in channel_users}
+    return sum(timezones[row['name1']] != timezones[row['name2']] for row in schedule)
+
+
+def get_schedule_members(schedule: List[Dict[str, str]]) -> set:
+    """
+    Every channel member is matched in each scheduled round, so the names in the
+    schedule are the channel members at the time it was planned.
+    """
+    return {name for row in schedule for name in (row['name1'], row['name2'])}
+
+
+def schedule_row(round_id: str, match: Dict) -> Dict[str, str]:
+    return {
+        'round': round_id,
+        'name1': match['user1']['name'],
+        'name2': match['user2']['name'],
+        'match_strength': str(match['match_strength'])
+    }
+
+
+def schedule_to_history(schedule: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """
+    Convert scheduled pairings to history entries so they can be counted as previous matches when scoring.
+    """
+    return [{
+        'name1': row['name1'],
+        'name2': row['name2'],
+        'match_date': SCHEDULED_MATCH_DATE
+    } for row in schedule]
+
+
 def record_match(host: str, guest: str, meet_date: str, matches: Dict[str, Dict[str, List[str]]]):
     """
     Records a given meeting in the history for the host.
@@ -322,17 +757,17 @@ def record_match(host: str, guest: str, meet_date: str, matches: Dict[str, Dict[
         matches[host][guest].append(meet_date)
 
 
+def get_times_paired(name1: str, name2: str, past_matches: Dict[str, Dict[str, List[str]]]) -> int:
+    if name1 not in past_matches or name2 not in past_matches[name1]:
+        return 0
+    return len(past_matches[name1][name2])
+
+
 def calculate_match_strength(user1: Dict, user2: Dict, past_matches: Dict[str, Dict[str, List[str]]]) -> int:
     """
     Provides a weighting/metric for how "good" a potential pairing is.
     """
-    name1: str = user1['name']
-    name2: str = user2['name']
-    if name1 not in past_matches or name2 not in past_matches[name1]:
-        times_paired = 0
-    else:
-        times_paired = len(past_matches[name1][name2])
-
+    times_paired: int = get_times_paired(user1['name'], user2['name'], past_matches)
     is_diff_tz = (user1['tz'] != user2['tz'])
 
     # Users in different timezones prioritised, but won't match the same person again until you have met everyone else
@@ -348,7 +783,14 @@ def get_history_file_path(channel_id: str, channel_name: str, history_dir: str):
     return channel_history_file
 
 
-def write_history(history: List[Dict[str, str]], filepath: str):
+def get_schedule_file_path(channel_id: str, channel_name: str, history_dir: str):
+    channel_schedule_file = f"{channel_name}_{channel_id}_schedule.csv"
+    if history_dir is not None:
+        channel_schedule_file = f"{history_dir}{channel_schedule_file}"
+    return channel_schedule_file
+
+
+def write_history(history: List[Dict[str, str]], filepath: str, field_names: List[str] = CSV_FIELD_NAMES):
     directories: str = "/".join(filepath.split("/")[:-1])
 
     # ensure our history directory exists
@@ -356,7 +798,7 @@ def write_history(history: List[Dict[str, str]], filepath: str):
         os.makedirs(directories, exist_ok=True)
 
     with open(filepath, 'w', newline='') as csv_file:
-        writer = csv.DictWriter(csv_file, fieldnames=CSV_FIELD_NAMES)
+        writer = csv.DictWriter(csv_file, fieldnames=field_names)
         writer.writeheader()
         writer.writerows(history)
 
@@ -378,15 +820,19 @@ def pull_history_from_s3(bucket_name: str, out_dir: str = "/tmp/"):
         bucket.download_file(s3_object.key, f"{out_dir}{filename}")
 
 
-def push_history_to_s3(bucket_name: str, channel: str, history_dir: str = "/tmp/"):
-    channel_name, channel_id = channel.split(":")
-    local_file: str = get_history_file_path(channel_id, channel_name, history_dir)
+def push_file_to_s3(bucket_name: str, local_file: str, label: str):
+    """
+    Upload a local file to the root of the bucket
+    :param bucket_name: Bucket to upload to
+    :param local_file: The file to upload
+    :param label: What the file is, used when logging the upload
+    """
     s3_file_name: str = local_file.split("/")[-1]
     file_uploaded: bool = upload_file(local_file, bucket_name, s3_file_name)
     if file_uploaded:
-        print(f"Uploaded history for channel: {channel} to s3://{bucket_name}/{s3_file_name}")
+        print(f"Uploaded {label} to s3://{bucket_name}/{s3_file_name}")
     else:
-        print(f"Unable to upload history for channel: {channel}")
+        print(f"Unable to upload {label}")
 
 
 def upload_file(file_name: str, bucket: str, object_name: str = None):
@@ -0,0 +1,123 @@
+import unittest
+from typing import List, Dict
+from unittest import mock
+
+import doughnut
+
+
+def make_users(count: int, prefix: str = 'u') -> List[Dict]:
+    return [{'id': f'{prefix}{i}', 'name': f'{prefix}{i}', 'tz': 'A' if i % 2 else 'B'} for i in range(count)]
+
+
+def make_history(users: List[Dict], rounds: int) -> List[Dict[str, str]]:
+    history: List[Dict[str, str]] = []
+    for _ in range(rounds):
+        history += [{
+            'name1': match['user1']['name'],
+            'name2': match['user2']['name'],
+            'match_date': '2021-08-31'
+        } for match in doughnut.create_matches(users, history)]
+    return history
+
+
+def pair_counts(schedule: List[Dict[str, str]]) -> Dict[frozenset, int]:
+    counts: Dict[frozenset, int] = {}
+    for row in schedule:
+        pair: frozenset = frozenset((row['name1'], row['name2']))
+        counts[pair] = counts.get(pair, 0) + 1
+    return counts
+
+
+def round_members(schedule: List[Dict[str, str]]) -> Dict[str, set]:
+    members: Dict[str, set] = {}
+    for row in schedule:
+        members.setdefault(row['round'], set()).update((row['name1'], row['name2']))
+    return members
+
+
+class TestSchedule(unittest.TestCase):
+
+    def test_plan_schedule_has_no_repeats_in_a_full_round_robin(self):
+        for count in [2, 6, 8, 10, 20]:
+            users: List[Dict] = make_users(count)
+            schedule: List[Dict[str, str]] = doughnut.plan_schedule(users, [], count - 1)
+            self.assertEqual(max(pair_counts(schedule).values()), 1)
+            for members in round_members(schedule).values():
+                self.assertEqual(members, {user['name'] for user in users})
+
+    def test_plan_schedule_matches_everyone_with_an_odd_number_of_users(self):
+        users: List[Dict] = make_users(7)
+        schedule: List[Dict[str, str]] = doughnut.plan_schedule(users, [], 6)
+        self.assertEqual(len(round_members(schedule)), 6)
+        for members in round_members(schedule).values():
+            self.assertEqual(members, {user['name'] for user in users})
+
+    def test_plan_schedule_falls_back_beyond_a_full_round_robin(self):
+        users: List[Dict] = make_users(4)
+        schedule: List[Dict[str, str]] = doughnut.plan_schedule(users, [], 5)
+        self.assertEqual(sorted(round_members(schedule)), ['1', '2', '3', '4', '5'])
+
+    def test_plan_schedule_does_not_repeat_past_matches(self):
+        users: List[Dict] = make_users(20)
+        history: List[Dict[str, str]] = make_history(users, 4)
+        schedule: List[Dict[str, str]] = doughnut.plan_schedule(users, history, 4)
+
+        past_pairs: set = set(pair_counts(history))
+        self.assertEqual([pair for pair in pair_counts(schedule) if pair in past_pairs], [])
+        self.assertEqual(max(pair_counts(schedule).values()), 1)
+
+    def test_plan_schedule_mixes_timezones(self):
+        users: List[Dict] = [
+            {'id': name, 'name': name, 'tz': tz} for name, tz in [('a1', 'A'), ('a2', 'A'), ('b1', 'B'), ('b2', 'B')]
+        ]
+        schedule: List[Dict[str, str]] = doughnut.plan_schedule(users, [], 1)
+        self.assertEqual(doughnut.count_cross_timezone(schedule, users), 2)
+
+        users = make_users(8)
+        schedule = doughnut.plan_schedule(users, [], 4)
+        self.assertGreaterEqual(doughnut.count_cross_timezone(schedule, users), 12)
+
+    def test_repair_schedule_matches_every_member_without_repeating_new_users(self):
+        users: List[Dict] = make_users(6)
+        schedule: List[Dict[str, str]] = doughnut.plan_schedule(users, [], 5)
+
+        users += make_users(2, prefix='n')
+        doughnut.repair_schedule(users, [], schedule)
+
+        for members in round_members(schedule).values():
+            self.assertEqual(members, {user['name'] for user in users})
+        self.assertLessEqual(pair_counts(schedule).get(frozenset(('n0', 'n1')), 0), 1)
+
+    def test_repair_schedule_does_not_strand_partners_of_leavers(self):
+        users: List[Dict] = make_users(8)
+        schedule: List[Dict[str, str]] = doughnut.plan_schedule(users, [], 5)
+
+        users = users[2:]
+        doughnut.repair_schedule(users, [], schedule)
+
+        for members in round_members(schedule).values():
+            self.assertEqual(members, {user['name'] for user in users})
+        self.assertLessEqual(max(pair_counts(schedule).values()), 2)
+
+    def test_next_scheduled_round_only_takes_the_next_round(self):
+        users: List[Dict] = make_users(6)
+        schedule: List[Dict[str, str]] = doughnut.plan_schedule(users, [], 3)
+
+        with mock.patch.object(doughnut, 'SCHEDULE_ROUNDS', 3):
+            matches: List[Dict] = doughnut.next_scheduled_round(users, [], schedule)
+
+        self.assertEqual(len(matches), 3)
+        self.assertEqual(sorted(round_members(schedule)), ['2', '3'])
+
+    def test_next_scheduled_round_replans_a_schedule_longer_than_schedule_rounds(self):
+        users: List[Dict] = make_users(6)
+        schedule: List[Dict[str, str]] = doughnut.plan_schedule(users, [], 5)
+
+        with mock.patch.object(doughnut, 'SCHEDULE_ROUNDS', 2):
+            doughnut.next_scheduled_round(users, [], schedule)
+
+        self.assertEqual(sorted(round_members(schedule)), ['2'])
+
+
+if __name__ == '__main__':
+    unittest.main()